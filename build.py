@@ -30,6 +30,10 @@ def create_standalone():
     ]
     print("Menginstall/memperbarui dependensi untuk build...")
     subprocess.run([sys.executable, "-m", "pip", "install", *build_deps], check=True)
+
+    # orjson opsional: GUI tetap jalan dengan json bawaan jika gagal diinstall
+    print("Menginstall dependensi opsional (orjson)...")
+    subprocess.run([sys.executable, "-m", "pip", "install", "orjson==3.9.15"], check=False)
     
     # Buat folder dist jika belum ada
     dist_dir = Path("dist")
@@ -74,6 +78,7 @@ a = Analysis(
         'aria2p.client',
         'requests.adapters',
         'requests.packages.urllib3',
+        'orjson',  # opsional, diabaikan PyInstaller jika tidak terinstall
         'workers',
         'terabox_cli',
         'concurrent.futures',
@@ -155,6 +160,9 @@ coll = COLLECT(
                 img = Image.open(BytesIO(png_data))
                 images.append(img)
             
+            # PNG 64x64 dipakai GUI sebagai ikon jendela tanpa perlu cairosvg saat runtime
+            images[sizes.index(64)].save("icon/box_64.png", format="PNG")
+            
             # Simpan sebagai ICO
             images[0].save(
                 "icon/box.ico",
@@ -327,7 +335,9 @@ def create_portable():
         "requests>=2.28.0,<3.0.0",
         "aria2p>=0.12.0,<1.0.0",
         "rich>=13.0.0,<14.0.0",
-        "pillow>=10.0.0,<11.0.0"
+        "pillow>=10.0.0,<11.0.0",
+        "# Opsional: mempercepat baca/tulis history GUI (tanpa ini pakai json bawaan)",
+        "orjson==3.9.15"
     ]
     
     with open(portable_dir / "requirements.txt", "w") as f:
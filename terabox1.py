@@ -1,13 +1,23 @@
 import re, requests, math, random
+from typing import Optional
+
+#--> Fresh session (own cookies & default headers) that borrows the caller's connection pool
+def pooledSession(session:Optional[requests.Session]=None) -> requests.Session:
+
+    r = requests.Session()
+    if session is not None:
+        for prefix, adapter in session.adapters.items(): r.mount(prefix, adapter)
+    return r
 
 headers : dict[str, str] = {'user-agent':'Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Mobile Safari/537.36'}
 
 class TeraboxFile():
 
     #--> Initialization (requests, headers, and result)
-    def __init__(self) -> None:
+    def __init__(self, session:Optional[requests.Session]=None) -> None:
 
-        self.r : object = requests.Session()
+        #--> Cookies must not leak between share links, so only the pool is shared
+        self.r : object = pooledSession(session)
         self.headers : dict[str,str] = headers
         self.result : dict[str,any] = {'status':'failed', 'js_token':'', 'browser_id':'', 'cookie':'', 'sign':'', 'timestamp':'', 'shareid':'', 'uk':'', 'list':[]}
 
@@ -84,9 +94,10 @@ class TeraboxFile():
 class TeraboxLink():
 
     #--> Initialization (requests, headers, payload, and result)
-    def __init__(self, fs_id:str, uk:str, shareid:str, timestamp:str, sign:str, js_token:str, cookie:str) -> None:
+    def __init__(self, fs_id:str, uk:str, shareid:str, timestamp:str, sign:str, js_token:str, cookie:str, session:Optional[requests.Session]=None) -> None:
 
-        self.r : object = requests.Session()
+        self.r : object = pooledSession(session)
+        self.own_session : bool = session is None
         self.headers : dict[str,str] = headers
         self.result : dict[str,dict] = {'status':'failed', 'download_link':{}}
         self.cookie : str = cookie
@@ -126,20 +137,19 @@ class TeraboxLink():
 
             self.generateFastURL()
         
-        self.r.close()
+        #--> Closing would also close the borrowed pool adapters
+        if self.own_session: self.r.close()
 
     #--> Generate fast download link
     def generateFastURL(self) -> None:
 
-        r = requests.Session()
         try:
-            old_url    : str = r.head(self.result['download_link']['url_1'], allow_redirects=True).url
+            old_url    : str = self.r.head(self.result['download_link']['url_1'], allow_redirects=True).url
             old_domain : str = re.search(r'://(.*?)\.',str(old_url)).group(1)
             medium_url : str = old_url.replace('by=themis', 'by=dapunta')
             fast_url   : str = old_url.replace(old_domain,'d3').replace('by=themis', 'by=dapunta')
             self.result['download_link'].update({'url_2':medium_url, 'url_3':fast_url})
         except: pass
-        r.close()
 
     #--> Generate dp-logid (deprecated / not used)
     def getDpLogId(self, uk=None) -> str:
@@ -1,4 +1,5 @@
 import os
+import re
 import sys
 import time
 import requests
@@ -30,11 +31,60 @@ import logging
 import subprocess
 import json
 import aria2p
+import collections
 
 console = Console()
 
+# Subdomain CDN TeraBox yang diarahkan ke d.terabox.com
+_CDN_RE = re.compile(r'//(?:cdn|[abc])\.')
+
+_VIDEO_EXTS = ('.mp4', '.mov', '.m4v', '.mkv', '.asf', '.avi', '.wmv', '.m2ts', '.3g2')
+_IMAGE_EXTS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg')
+_DOC_EXTS = ('.pdf', '.docx', '.zip', '.rar', '.7z')
+
+# Jumlah file yang link-nya di-resolve dan dimasukkan ke aria2 di depan file yang sedang didownload
+_ARIA2_LINK_AHEAD = 3
+
+def _file_type_for_name(name: str) -> str:
+    """Tipe file dari nama (huruf kecil); ekstensi dicari di mana saja dalam nama
+    sehingga 'movie.mp4.part' atau 'video.mkv.001' tetap dianggap video"""
+    if any(ext in name for ext in _VIDEO_EXTS):
+        return 'video'
+    elif any(ext in name for ext in _IMAGE_EXTS):
+        return 'image'
+    elif any(ext in name for ext in _DOC_EXTS):
+        return 'file'
+    else:
+        return 'other'
+
+def _format_size(size: float) -> str:
+    """Format ukuran (dalam byte) ke string"""
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if size < 1024:
+            return f"{size:.2f} {unit}"
+        size /= 1024
+    return f"{size:.2f} PB"
+
+class PooledAria2Client(aria2p.Client):
+    """aria2p.Client yang mengirim JSON-RPC lewat satu requests.Session keep-alive.
+    
+    Client bawaan memanggil requests.post untuk setiap RPC sehingga tiap panggilan
+    membuka koneksi baru ke localhost:6800.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._session = requests.Session()
+        self._session.headers.update({"Connection": "keep-alive"})
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self._session.mount("http://", adapter)
+    
+    def post(self, payload):
+        return self._session.post(self.server, data=payload, timeout=getattr(self, "timeout", 60)).json()
+
 class TeraboxDownloader:
-    def __init__(self):
+    def __init__(self, start_aria2: bool = True):
+        """start_aria2=False dipakai GUI, yang menjalankan dan mematikan aria2c sendiri."""
         self.chunk_size = 16 * 1024 * 1024  # Meningkatkan chunk size ke 16MB
         self.max_workers = min(64, multiprocessing.cpu_count() * 8)  # Meningkatkan jumlah workers
         self.session = self._create_session()
@@ -71,9 +121,9 @@ class TeraboxDownloader:
         self.url_log_dir = Path("url_logs")
         self.url_log_dir.mkdir(exist_ok=True)
         
-        # Cek keberadaan aria2c
-        self.use_aria2 = self._setup_aria2()
-        if not self.use_aria2:
+        # Cek keberadaan aria2c; hanya satu pihak yang boleh menjalankan aria2c di port 6800
+        self.use_aria2 = self._setup_aria2() if start_aria2 else False
+        if start_aria2 and not self.use_aria2:
             console.print(Panel("[yellow]⚠️ aria2 tidak ditemukan, menggunakan metode download default[/]", border_style="yellow"))
 
     def _setup_aria2(self) -> bool:
@@ -101,7 +151,7 @@ class TeraboxDownloader:
                 
                 # Initialize aria2p API
                 self.aria2 = aria2p.API(
-                    aria2p.Client(
+                    PooledAria2Client(
                         host="http://localhost",
                         port=6800,
                         secret=""
@@ -260,9 +310,7 @@ wss://tracker.openwebtorrent.com:443/announce"""
         }
         
         config_path = Path('aria2.conf')
-        with open(config_path, 'w') as f:
-            for key, value in config.items():
-                f.write(f'{key}={value}\n')
+        config_path.write_text(''.join(f'{key}={value}\n' for key, value in config.items()))
                 
         return str(config_path)
 
@@ -327,17 +375,18 @@ wss://tracker.openwebtorrent.com:443/announce"""
                     
                 time.sleep(1)
             
-            # Verifikasi hasil download
-            if os.path.exists(filename):
-                actual_size = os.path.getsize(filename)
-                if actual_size == filesize:
-                    if not quiet:
-                        console.print(Panel("[bold green]✅ Download selesai![/]", border_style="green"))
-                    return True
-                else:
-                    raise Exception(f"Ukuran file tidak sesuai (expected: {filesize}, actual: {actual_size})")
-            
-            raise Exception("File tidak ditemukan setelah download selesai")
+            # Verifikasi hasil download (satu stat untuk cek keberadaan sekaligus ukuran)
+            try:
+                actual_size = os.stat(filename).st_size
+            except FileNotFoundError:
+                raise Exception("File tidak ditemukan setelah download selesai")
+                
+            if actual_size == filesize:
+                if not quiet:
+                    console.print(Panel("[bold green]✅ Download selesai![/]", border_style="green"))
+                return True
+            else:
+                raise Exception(f"Ukuran file tidak sesuai (expected: {filesize}, actual: {actual_size})")
             
         except Exception as e:
             self.handle_error(e, "Download dengan aria2 gagal")
@@ -406,13 +455,7 @@ wss://tracker.openwebtorrent.com:443/announce"""
             size = 0
             
         # Ensure size is a number
-        size = float(size)
-        
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size < 1024:
-                return f"{size:.2f} {unit}"
-            size /= 1024
-        return f"{size:.2f} PB"
+        return _format_size(float(size))
 
     def create_file_table(self, files: List[Dict[str, Any]]) -> Table:
         """Membuat tabel untuk menampilkan daftar file"""
@@ -492,15 +535,7 @@ wss://tracker.openwebtorrent.com:443/announce"""
 
     def _get_file_type(self, name: str) -> str:
         """Mendapatkan tipe file"""
-        name = name.lower()
-        if any(ext in name for ext in ['.mp4', '.mov', '.m4v', '.mkv', '.asf', '.avi', '.wmv', '.m2ts', '.3g2']):
-            return 'video'
-        elif any(ext in name for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg']):
-            return 'image'
-        elif any(ext in name for ext in ['.pdf', '.docx', '.zip', '.rar', '.7z']):
-            return 'file'
-        else:
-            return 'other'
+        return _file_type_for_name(name.lower())
 
     def select_file(self, files: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """Memilih file untuk didownload"""
@@ -583,143 +618,58 @@ wss://tracker.openwebtorrent.com:443/announce"""
         failed_downloads = []
         start_time = time.time()
         
-        # Download setiap file
-        for idx, file in enumerate(flattened_files, 1):
-            console.print(f"[bold blue]({idx}/{total_files})[/] ", end="")
-            
-            try:
-                # Dapatkan link download
-                with console.status(f"🔗 Mengambil link untuk {file['name']}...", spinner="dots"):
-                    tl = TeraboxLink(
-                        fs_id=str(file['fs_id']),
-                        uk=str(tf.result['uk']),
-                        shareid=str(tf.result['shareid']),
-                        timestamp=str(tf.result['timestamp']),
-                        sign=str(tf.result['sign']),
-                        js_token=str(tf.result['js_token']),
-                        cookie=str(tf.result['cookie'])
-                    )
-                    tl.generate()
+        if self.use_aria2:
+            # Semua file langsung dimasukkan ke antrian aria2; aria2 sendiri yang menjalankannya
+            # satu per satu (max-concurrent-downloads=1) tanpa jeda antar file
+            if not self._download_all_with_aria2(flattened_files, tf, download_dir, failed_downloads):
+                return
+            successful_downloads = total_files - len(failed_downloads)
+        else:
+            # Download setiap file; link file berikutnya di-resolve di background
+            # selagi file saat ini didownload
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as prefetch_executor:
+                next_link = prefetch_executor.submit(self._resolve_link, flattened_files[0], tf)
                 
-                if tl.result['status'] != 'success':
-                    failed_downloads.append((file['name'], "Gagal mendapatkan link download"))
-                    continue
+                for idx, file in enumerate(flattened_files, 1):
+                    console.print(f"[bold blue]({idx}/{total_files})[/] ", end="")
                     
-                # Dapatkan URL download dengan domain d.terabox.com
-                download_url = tl.result['download_link'].get('url_1', '')
-                if download_url:
-                    download_url = download_url.replace('//cdn.', '//d.').replace('//c.', '//d.').replace('//b.', '//d.').replace('//a.', '//d.')
-                else:
-                    failed_downloads.append((file['name'], "Tidak ada URL download yang valid"))
-                    continue
-                
-                # Download file dengan aria2 jika tersedia
-                if self.use_aria2:
-                    filename = download_dir / file['name']
-                    filesize = int(file['size'])
+                    current_link = next_link
+                    if idx < total_files:
+                        next_link = prefetch_executor.submit(self._resolve_link, flattened_files[idx], tf)
                     
-                    # Tambahkan download ke aria2
                     try:
-                        download = self.aria2.add_uris(
-                            [download_url],
-                            options={
-                                "dir": str(download_dir),
-                                "out": file['name'],
-                                "max-connection-per-server": "16",
-                                "split": "16",
-                                "min-split-size": "1M",
-                                "max-concurrent-downloads": "1",
-                                "continue": "true",
-                                "max-tries": "10",
-                                "retry-wait": "3",
-                                "connect-timeout": "60",
-                                "timeout": "60",
-                                "max-file-not-found": "5",
-                                "max-overall-download-limit": "0",
-                                "max-download-limit": "0",
-                                "file-allocation": "none",
-                                "auto-file-renaming": "false",
-                                "allow-overwrite": "true"
-                            }
-                        )
-                        
-                        # Monitor progress
-                        last_progress = -1
-                        no_progress_time = time.time()
-                        
-                        while not download.is_complete:
-                            if self.cancel_event.is_set():
-                                download.remove()
-                                console.print("\n[bold red]Download dibatalkan![/]")
-                                return
-                            
-                            try:
-                                download.update()
-                                progress = download.progress
-                                speed = download.download_speed
-                                
-                                if progress != last_progress:
-                                    last_progress = progress
-                                    no_progress_time = time.time()
-                                    console.print(f"[cyan]Progress: {progress:.1f}% ({self.format_size(speed)}/s)[/]")
-                                elif time.time() - no_progress_time > 30:
-                                    raise Exception("Download timeout - tidak ada progress selama 30 detik")
-                                    
-                            except aria2p.client.ClientException as e:
-                                self.logger.error(f"Aria2 error: {str(e)}")
-                                console.print(f"[red]Error: {str(e)}[/]")
-                                continue
-                                
-                            time.sleep(1)
+                        # Dapatkan link download (biasanya sudah selesai di-prefetch)
+                        try:
+                            with console.status(f"🔗 Mengambil link untuk {file['name']}...", spinner="dots"):
+                                download_url = current_link.result()
+                        except Exception as e:
+                            failed_downloads.append((file['name'], str(e)))
+                            continue
                         
-                        # Verifikasi hasil download
-                        if os.path.exists(filename):
-                            actual_size = os.path.getsize(filename)
-                            if actual_size == filesize:
-                                successful_downloads += 1
-                                console.print(Panel(
-                                    f"[green]✅ {file['name']} berhasil didownload[/]",
-                                    border_style="green"
-                                ))
-                                continue
-                            else:
-                                raise Exception(f"Ukuran file tidak sesuai (expected: {filesize}, actual: {actual_size})")
-                        
-                        raise Exception("File tidak ditemukan setelah download selesai")
+                        # Gunakan metode download default karena aria2 tidak tersedia
+                        filename = download_dir / file['name']
+                        filesize = int(file['size'])
                         
+                        if self.download_file(download_url, str(filename), filesize, quiet=True):
+                            successful_downloads += 1
+                            console.print(Panel(
+                                f"[green]✅ {file['name']} berhasil didownload[/]",
+                                border_style="green"
+                            ))
+                        else:
+                            failed_downloads.append((file['name'], "Gagal saat download"))
+                            console.print(Panel(
+                                f"[red]❌ {file['name']} gagal didownload[/]",
+                                border_style="red"
+                            ))
+                    
                     except Exception as e:
                         failed_downloads.append((file['name'], str(e)))
                         console.print(Panel(
-                            f"[red]❌ {file['name']} gagal didownload: {str(e)}[/]",
+                            f"[red]❌ Error: {str(e)}[/]",
                             border_style="red"
                         ))
                         continue
-                        
-                else:
-                    # Gunakan metode download default jika aria2 tidak tersedia
-                    filename = download_dir / file['name']
-                    filesize = int(file['size'])
-                    
-                    if self.download_file(download_url, str(filename), filesize, quiet=True):
-                        successful_downloads += 1
-                        console.print(Panel(
-                            f"[green]✅ {file['name']} berhasil didownload[/]",
-                            border_style="green"
-                        ))
-                    else:
-                        failed_downloads.append((file['name'], "Gagal saat download"))
-                        console.print(Panel(
-                            f"[red]❌ {file['name']} gagal didownload[/]",
-                            border_style="red"
-                        ))
-                
-            except Exception as e:
-                failed_downloads.append((file['name'], str(e)))
-                console.print(Panel(
-                    f"[red]❌ Error: {str(e)}[/]",
-                    border_style="red"
-                ))
-                continue
 
         # Tampilkan ringkasan akhir
         duration = time.time() - start_time
@@ -753,6 +703,194 @@ wss://tracker.openwebtorrent.com:443/announce"""
                 border_style="green"
             ))
 
+    def _download_all_with_aria2(self, files: List[Dict[str, Any]], tf: Any, download_dir: Path, failed_downloads: List[tuple]) -> bool:
+        """Masukkan file ke antrian aria2 sesuai urutan lalu pantau satu per satu.
+        
+        Link di-resolve dan ditambahkan ke aria2 di background paling banyak _ARIA2_LINK_AHEAD
+        file di depan file yang sedang dipantau, supaya dlink tidak kedaluwarsa sebelum
+        download-nya dimulai. Mengembalikan False jika download dibatalkan lewat cancel_download().
+        """
+        self.cancel_event.clear()
+        link_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        pending = collections.deque()
+        active = []
+        next_idx = 0
+        
+        try:
+            for idx, file in enumerate(files, 1):
+                # Jaga jendela resolve tetap terisi tanpa me-resolve semua link sekaligus
+                while next_idx < len(files) and len(pending) < _ARIA2_LINK_AHEAD:
+                    pending.append(link_executor.submit(self._add_to_aria2, files[next_idx], tf, download_dir))
+                    next_idx += 1
+                slot = pending[0]
+                
+                # Tunggu link file ini siap sambil tetap memperhatikan pembatalan
+                with console.status(f"🔗 ({idx}/{len(files)}) Mengambil link untuk {file['name']}...", spinner="dots"):
+                    while not slot.done() and not self.cancel_event.is_set():
+                        concurrent.futures.wait([slot], timeout=0.5)
+                if self.cancel_event.is_set():
+                    break
+                pending.popleft()
+                    
+                try:
+                    download = slot.result()
+                except Exception as e:
+                    failed_downloads.append((file['name'], str(e)))
+                    console.print(Panel(
+                        f"[red]❌ {file['name']} gagal didownload: {str(e)}[/]",
+                        border_style="red"
+                    ))
+                    continue
+                active.append(download)
+                    
+                console.print(f"[bold blue]({idx}/{len(files)})[/] ", end="")
+                
+                filename = download_dir / file['name']
+                filesize = int(file['size'])
+                
+                try:
+                    # Monitor progress
+                    last_progress = -1
+                    no_progress_time = time.time()
+                    
+                    while not download.is_complete and not self.cancel_event.is_set():
+                        try:
+                            download.update()
+                            progress = download.progress
+                            speed = download.download_speed
+                            
+                            if progress != last_progress:
+                                last_progress = progress
+                                no_progress_time = time.time()
+                                console.print(f"[cyan]Progress: {progress:.1f}% ({self.format_size(speed)}/s)[/]")
+                            elif time.time() - no_progress_time > 30:
+                                raise Exception("Download timeout - tidak ada progress selama 30 detik")
+                                
+                        except aria2p.client.ClientException as e:
+                            self.logger.error(f"Aria2 error: {str(e)}")
+                            console.print(f"[red]Error: {str(e)}[/]")
+                            continue
+                            
+                        time.sleep(1)
+                    
+                    # Dibatalkan: jangan verifikasi file yang memang belum selesai
+                    if self.cancel_event.is_set():
+                        break
+                    
+                    # Verifikasi hasil download (satu stat untuk cek keberadaan sekaligus ukuran)
+                    try:
+                        actual_size = os.stat(filename).st_size
+                    except FileNotFoundError:
+                        raise Exception("File tidak ditemukan setelah download selesai")
+                        
+                    if actual_size != filesize:
+                        raise Exception(f"Ukuran file tidak sesuai (expected: {filesize}, actual: {actual_size})")
+                    
+                    active.remove(download)
+                    console.print(Panel(
+                        f"[green]✅ {file['name']} berhasil didownload[/]",
+                        border_style="green"
+                    ))
+                    
+                except Exception as e:
+                    # Keluarkan dari antrian aria2 agar tidak menahan file berikutnya
+                    active.remove(download)
+                    try:
+                        download.remove()
+                    except Exception:
+                        pass
+                    failed_downloads.append((file['name'], str(e)))
+                    console.print(Panel(
+                        f"[red]❌ {file['name']} gagal didownload: {str(e)}[/]",
+                        border_style="red"
+                    ))
+                    
+        except BaseException:
+            # Ctrl+C / error lain: bersihkan antrian aria2 (daemon tetap hidup setelah CLI keluar)
+            self.cancel_event.set()
+            self._abort_aria2_queue(link_executor, pending, active)
+            raise
+        finally:
+            link_executor.shutdown(wait=False)
+            
+        if self.cancel_event.is_set():
+            self._abort_aria2_queue(link_executor, pending, active)
+            console.print("\n[bold red]Download dibatalkan![/]")
+            return False
+            
+        return True
+
+    def _add_to_aria2(self, file: Dict[str, Any], tf: Any, download_dir: Path) -> Optional[aria2p.Download]:
+        """Resolve link satu file lalu tambahkan ke antrian aria2 (None jika sudah dibatalkan)"""
+        if self.cancel_event.is_set():
+            return None
+        download_url = self._resolve_link(file, tf)
+        if self.cancel_event.is_set():
+            return None
+        return self.aria2.add_uris(
+            [download_url],
+            options={
+                "dir": str(download_dir),
+                "out": file['name'],
+                "max-connection-per-server": "16",
+                "split": "16",
+                "min-split-size": "1M",
+                "max-concurrent-downloads": "1",
+                "continue": "true",
+                "max-tries": "10",
+                "retry-wait": "3",
+                "connect-timeout": "60",
+                "timeout": "60",
+                "max-file-not-found": "5",
+                "max-overall-download-limit": "0",
+                "max-download-limit": "0",
+                "file-allocation": "none",
+                "auto-file-renaming": "false",
+                "allow-overwrite": "true"
+            }
+        )
+
+    def _abort_aria2_queue(self, link_executor: concurrent.futures.ThreadPoolExecutor, pending: "collections.deque", active: List[Any]) -> None:
+        """Hentikan resolve link yang tersisa dan hapus download yang sudah masuk aria2"""
+        for slot in pending:
+            slot.cancel()
+        # Resolve yang sedang berjalan akan melihat cancel_event sebelum add_uris
+        link_executor.shutdown(wait=True)
+        for slot in pending:
+            if slot.done() and not slot.cancelled() and slot.exception() is None and slot.result() is not None:
+                active.append(slot.result())
+        pending.clear()
+        
+        if active:
+            try:
+                self.aria2.remove(active, force=True)
+            except Exception as e:
+                self.logger.error(f"Gagal menghapus download dari aria2: {str(e)}")
+            active.clear()
+
+    def _resolve_link(self, file: Dict[str, Any], tf: Any) -> str:
+        """Mendapatkan URL download (domain d.terabox.com) untuk satu file"""
+        tl = TeraboxLink(
+            fs_id=str(file['fs_id']),
+            uk=str(tf.result['uk']),
+            shareid=str(tf.result['shareid']),
+            timestamp=str(tf.result['timestamp']),
+            sign=str(tf.result['sign']),
+            js_token=str(tf.result['js_token']),
+            cookie=str(tf.result['cookie']),
+            session=self.session
+        )
+        tl.generate()
+        
+        if tl.result['status'] != 'success':
+            raise Exception("Gagal mendapatkan link download")
+            
+        download_url = tl.result['download_link'].get('url_1', '')
+        if not download_url:
+            raise Exception("Tidak ada URL download yang valid")
+            
+        return _CDN_RE.sub('//d.', download_url)
+
     def test_download_speed(self, urls: List[str], sample_size: int = 1024 * 1024) -> str:
         """Test kecepatan download dengan caching"""
         # Ambil URL dengan domain d.terabox.com
@@ -763,7 +901,7 @@ wss://tracker.openwebtorrent.com:443/announce"""
         # Jika tidak ada yang menggunakan d.terabox.com, ubah domain URL pertama
         if urls:
             url = urls[0]
-            return url.replace('//cdn.', '//d.').replace('//c.', '//d.').replace('//b.', '//d.').replace('//a.', '//d.')
+            return _CDN_RE.sub('//d.', url)
             
         return urls[0] if urls else ""
 
@@ -789,7 +927,7 @@ wss://tracker.openwebtorrent.com:443/announce"""
         temp_filename = filename + ".tmp"
         
         try:
-            with requests.get(url, stream=True, timeout=self.read_timeout) as response:
+            with self.session.get(url, stream=True, timeout=self.read_timeout) as response:
                 response.raise_for_status()
                 
                 if not quiet:
@@ -870,8 +1008,10 @@ wss://tracker.openwebtorrent.com:443/announce"""
                 raise Exception("Ukuran file tidak sesuai")
 
         except Exception as e:
-            if os.path.exists(temp_filename):
+            try:
                 os.remove(temp_filename)
+            except FileNotFoundError:
+                pass
             self.handle_error(e, "Download gagal")
             return False
 
@@ -945,7 +1085,7 @@ wss://tracker.openwebtorrent.com:443/announce"""
             self.logger.info(f"🔗 Memproses URL: {url}")
             
             with console.status("[bold blue]🔍 Mengambil informasi file...[/]", spinner="dots"):
-                tf = TeraboxFile()
+                tf = TeraboxFile(session=self.session)
                 tf.search(url)
                 
             if tf.result['status'] != 'success':
@@ -1003,7 +1143,8 @@ wss://tracker.openwebtorrent.com:443/announce"""
                         timestamp=str(tf.result['timestamp']),
                         sign=str(tf.result['sign']),
                         js_token=str(tf.result['js_token']),
-                        cookie=str(tf.result['cookie'])
+                        cookie=str(tf.result['cookie']),
+                        session=self.session
                     )
                     tl.generate()
                 except Exception as e:
@@ -1017,7 +1158,7 @@ wss://tracker.openwebtorrent.com:443/announce"""
             # Dapatkan URL download dengan domain d.terabox.com
             download_url = tl.result['download_link'].get('url_1', '')
             if download_url:
-                download_url = download_url.replace('//cdn.', '//d.').replace('//c.', '//d.').replace('//b.', '//d.').replace('//a.', '//d.')
+                download_url = _CDN_RE.sub('//d.', download_url)
             else:
                 console.print(Panel("[red]❌ Tidak ada URL download yang valid![/]", border_style="red"))
                 return
@@ -1096,19 +1237,12 @@ wss://tracker.openwebtorrent.com:443/announce"""
             return
 
     def verify_file_integrity(self, filename: str, expected_size: int) -> bool:
-        """Verifikasi integritas file"""
+        """Verifikasi integritas file berdasarkan ukurannya"""
+        # TeraBox tidak memberikan hash file, jadi membaca ulang seluruh isi file tidak
+        # memverifikasi apa pun; cukup bandingkan ukuran hasil download.
         try:
-            actual_size = os.path.getsize(filename)
-            if actual_size != expected_size:
-                return False
-                
-            # Baca file dalam chunks untuk mengecek corrupted data
-            with open(filename, 'rb') as f:
-                while chunk := f.read(8192):
-                    pass
-            return True
-            
-        except Exception:
+            return os.stat(filename).st_size == expected_size
+        except OSError:
             return False
             
     def cancel_download(self):
@@ -1124,8 +1258,11 @@ wss://tracker.openwebtorrent.com:443/announce"""
     def resume_download(self, filename: str, url: str, filesize: int) -> bool:
         """Implementasi resume download jika file terputus"""
         temp_file = filename + ".tmp"
-        if os.path.exists(temp_file):
-            current_size = os.path.getsize(temp_file)
+        try:
+            current_size = os.stat(temp_file).st_size
+        except FileNotFoundError:
+            current_size = None
+        if current_size is not None:
             if current_size < filesize:
                 headers = {'Range': f'bytes={current_size}-'}
                 try:
@@ -1,27 +1,62 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Union
 import threading
 import queue
 import json
+import hashlib
 import os
 from pathlib import Path
 from datetime import datetime, timedelta
-from terabox_cli import TeraboxDownloader
+from collections import OrderedDict
+from terabox_cli import TeraboxDownloader, PooledAria2Client
 import logging
-from rich.console import Console
 import requests
-from io import BytesIO
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import webbrowser
 import time
 import subprocess
-import aria2p
-import multiprocessing
+import socket
 import sv_ttk
-from PIL import Image, ImageTk
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
 import workers
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Jumlah maksimum URL yang daftar filenya disimpan di cache process_url
+FILE_CACHE_SIZE = 32
+
+# Jumlah maksimum file antrean yang didaftarkan ke aria2 dalam satu system.multicall
+ARIA2_BATCH_SIZE = 16
+
+# Jeda (ms) sebelum main thread Tk menampilkan update progress yang tertunda
+UI_FLUSH_MS = 250
+
+# State panel progress saat tidak ada download berjalan
+IDLE_UI_STATE = {
+    'progress': 0,
+    'file_name': "",
+    'speed': "",
+    'eta': "",
+    'progress_text': "Ready to download...",
+    'size_text': ""
+}
+
+# Jumlah entri history download yang disimpan dan jeda (ms) sebelum entri baru ditulis ke disk
+HISTORY_LIMIT = 100
+HISTORY_FLUSH_MS = 2000
+
+# Batas interval (detik) polling progres aria2; interval membesar selama progres stabil
+POLL_MIN_S = 0.25
+POLL_MAX_S = 2.0
+
+# Field yang diminta dari aria2.tellActive saat memantau progres
+ARIA2_PROGRESS_KEYS = ["gid", "status", "completedLength", "totalLength", "downloadSpeed"]
+
 class TeraboxGUI:
     """
     GUI implementation for TeraBox Downloader using tkinter and ttkthemes.
@@ -32,12 +67,16 @@ class TeraboxGUI:
     
     def __init__(self):
         """Initialize the TeraBox GUI application."""
-        self._file_cache = {}
-        self._last_file_check = 0
+        # url -> (file_list, share_params, expiry) dengan TTL per entri, dibatasi FILE_CACHE_SIZE
+        self._file_cache: "OrderedDict[str, Tuple[List[Dict[str, Any]], Dict[str, Any], float]]" = OrderedDict()
         self._cache_timeout = 300
         
-        self._ui_update_queue = queue.Queue()
-        self._ui_update_running = False
+        # Update progress terbaru dari thread download; flush ke main thread dijadwalkan hanya saat ada update
+        self._pending_ui: Optional[Dict[str, Any]] = None
+        self._pending_ui_lock = threading.Lock()
+        self._ui_flush_scheduled = False
+        self._last_ui: Dict[str, Any] = {}
+        self._last_progress_snapshot: Optional[Tuple[str, int, float]] = None
         
         self.root = tk.Tk()
         self.root.title("Trauso")
@@ -45,11 +84,20 @@ class TeraboxGUI:
         self.setup_logging()
         
         try:
+            # PNG 64x64 sudah di-render saat build; SVG (lewat cairosvg) hanya jika PNG tidak ada
+            png_path = Path("icon/box_64.png") if Path("icon/box_64.png").exists() else Path("_internal/icon/box_64.png")
             svg_path = Path("icon/box.svg") if Path("icon/box.svg").exists() else Path("_internal/icon/box.svg")
-            if svg_path.exists():
+            icon_image = None
+            # PIL hanya dibutuhkan untuk ikon, jadi diimpor di sini
+            from PIL import Image, ImageTk
+            if png_path.exists():
+                icon_image = Image.open(png_path)
+            elif svg_path.exists():
                 from cairosvg import svg2png
+                from io import BytesIO
                 png_data = svg2png(url=str(svg_path), output_width=64, output_height=64)
                 icon_image = Image.open(BytesIO(png_data))
+            if icon_image is not None:
                 icon_photo = ImageTk.PhotoImage(icon_image)
                 self.root.iconphoto(True, icon_photo)
                 self.logger.info("Berhasil mengatur ikon program")
@@ -61,26 +109,45 @@ class TeraboxGUI:
 
         sv_ttk.set_theme("light")
         
-        self.downloader = TeraboxDownloader()
-        self.console = Console()
+        # aria2c dijalankan oleh _setup_aria2 milik GUI (yang menyimpan handle prosesnya),
+        # bukan oleh TeraboxDownloader yang menjalankannya sebagai daemon tanpa handle
+        self.downloader = TeraboxDownloader(start_aria2=False)
         self.download_queue = queue.Queue()
-        self.current_downloads = {}
+        # gid -> status ringkas dari aria2.tellActive terakhir
+        self.current_downloads: Dict[str, Dict[str, str]] = {}
         
-        self.download_pool = ThreadPoolExecutor(max_workers=min(32, multiprocessing.cpu_count() * 4))
+        # Data didownload oleh aria2; pool ini hanya untuk mengambil link download secara paralel
+        self.download_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tb-dl")
         
         self.chunk_size = 16 * 1024 * 1024
-        self.max_workers = min(64, multiprocessing.cpu_count() * 8)
+        
+        # Penulisan settings/history dilakukan thread terpisah agar UI tidak menunggu disk
+        # Item antrean: (path, payload, append); append=False berarti tulis ulang file secara atomik
+        self._persist_q: "queue.Queue[Optional[Tuple[Path, bytes, bool]]]" = queue.Queue()
+        self._persist_thread = threading.Thread(target=self._persist_worker, daemon=True)
+        self._persist_thread.start()
         
         self.config_file = Path("config/settings.json")
         self.config_file.parent.mkdir(exist_ok=True)
         self.settings = self.load_settings()
+        self._aria2_conf_cache: Optional[Tuple[str, int, int]] = None
+        self._aria2_conf_hash: Optional[bytes] = None
         
+        self.http = self._create_http_session()
+        # Daftar tracker siap pakai untuk opsi bt-tracker (dipisah koma), diisi oleh update_trackers
+        self._bt_trackers: Optional[str] = None
         self.update_trackers()
         
+        self._aria2_process: Optional[subprocess.Popen] = None
         self._setup_aria2()
         
-        self.history_file = Path("config/download_history.json")
+        # History disimpan sebagai JSONL (entri terlama di atas); entri baru cukup di-append
+        self.history_file = Path("config/history.jsonl")
         self.history_file.parent.mkdir(exist_ok=True)
+        self._history_pending: List[Dict[str, Any]] = []
+        self._history_lock = threading.Lock()
+        self._history_flush_scheduled = False
+        self._history_lines = 0
         self.download_history = self.load_download_history()
         
         self.main_container = ttk.Frame(self.root)
@@ -94,9 +161,15 @@ class TeraboxGUI:
         
         self.current_url = ""
         self.file_list_data = []
+        # Indeks baris Treeview per fs_id (nama file tidak unik antar folder) dan file per iid
+        self._fsid_to_iid: Dict[str, str] = {}
+        self._iid_to_file: Dict[str, Dict[str, Any]] = {}
         
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         
+        self.download_thread = threading.Thread(target=self.process_download_queue, daemon=True)
+        self.download_thread.start()
+        
         self.root.after(1000, self.check_updates_on_startup)
         
     def setup_styles(self):
@@ -160,6 +233,23 @@ class TeraboxGUI:
         else:
             sv_ttk.set_theme("dark")
             
+    def _create_http_session(self) -> requests.Session:
+        """Membuat session HTTP yang dipakai ulang agar koneksi TCP/TLS tidak dibuka ulang."""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=64,
+            # Timeout tidak di-retry: workers.get_info/get_download_link sudah failover antar endpoint
+            max_retries=Retry(total=3, connect=0, read=0, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({
+            'User-Agent': self.settings.get("user_agent", "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"),
+            'Connection': 'keep-alive'
+        })
+        return session
+        
     def setup_logging(self):
         """Setup logging configuration for the GUI application."""
         log_dir = Path("logs")
@@ -180,6 +270,8 @@ class TeraboxGUI:
     def _setup_aria2(self) -> bool:
         """Setup aria2 dan aria2p"""
         try:
+            import aria2p
+            
             local_aria2 = Path("aria2/aria2c.exe")
             if not local_aria2.exists():
                 local_aria2 = Path("_internal/aria2/aria2c.exe")
@@ -196,7 +288,6 @@ class TeraboxGUI:
                     "--max-overall-download-limit=0",
                     "--max-download-limit=0",
                     "--file-allocation=none",
-                    "--daemon=true",
                     f"--disk-cache={self.chunk_size}",
                     "--async-dns=true",
                     "--enable-mmap=true",
@@ -216,7 +307,7 @@ class TeraboxGUI:
                     startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
                     startupinfo.wShowWindow = subprocess.SW_HIDE
                 
-                subprocess.Popen(
+                self._aria2_process = subprocess.Popen(
                     cmd,
                     stdout=subprocess.DEVNULL,
                     stderr=subprocess.DEVNULL,
@@ -225,7 +316,7 @@ class TeraboxGUI:
                 )
                 
                 self.aria2 = aria2p.API(
-                    aria2p.Client(
+                    PooledAria2Client(
                         host="http://localhost",
                         port=6800,
                         secret=""
@@ -511,11 +602,31 @@ class TeraboxGUI:
     def save_settings(self):
         """Save current settings to JSON file."""
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.settings, f, indent=4)
-            self.logger.info("Berhasil menyimpan konfigurasi")
+            # Serialisasi di sini agar yang ditulis adalah snapshot saat ini
+            self._persist_q.put((self.config_file, json.dumps(self.settings, indent=4).encode('utf-8'), False))
         except Exception as e:
             self.logger.error(f"Error saving settings: {str(e)}")
+    
+    def _persist_worker(self):
+        """Menulis file konfigurasi dari antrean: append, atau tulis ulang atomik (.tmp lalu os.replace)."""
+        while True:
+            job = self._persist_q.get()
+            try:
+                if job is None:
+                    return
+                path, payload, append = job
+                if append:
+                    with open(path, 'ab') as f:
+                        f.write(payload)
+                else:
+                    tmp = path.with_suffix(path.suffix + ".tmp")
+                    tmp.write_bytes(payload)
+                    os.replace(tmp, path)
+                self.logger.info(f"Berhasil menyimpan {path.name}")
+            except Exception as e:
+                self.logger.error(f"Error menyimpan {job[0] if job else ''}: {str(e)}")
+            finally:
+                self._persist_q.task_done()
 
     def show_settings(self):
         """Show the settings dialog."""
@@ -663,12 +774,18 @@ class TeraboxGUI:
             
         self.status_var.set("Memproses URL...")
         self.tree.delete(*self.tree.get_children())
+        self._fsid_to_iid.clear()
+        self._iid_to_file.clear()
         
         def process():
             try:
-                current_time = time.time()
-                if url in self._file_cache and current_time - self._last_file_check < self._cache_timeout:
-                    self.file_list_data = self._file_cache[url]
+                entry = self._file_cache.get(url)
+                if entry and entry[2] > time.monotonic():
+                    self._file_cache.move_to_end(url)
+                    self.file_list_data, share_params = entry[0], entry[1]
+                    # Parameter share harus ikut dipulihkan, kalau tidak link download memakai URL terakhir
+                    for key, value in share_params.items():
+                        setattr(self, key, value)
                     self.root.after(0, self.update_file_list)
                     self.status_var.set("URL berhasil diproses (cache)")
                     return
@@ -681,7 +798,7 @@ class TeraboxGUI:
                 self.logger.info(f"Memproses shorturl: {shorturl}")
                 
                 # Coba dapatkan info file
-                info = workers.get_info(shorturl)
+                info = workers.get_info(shorturl, session=self.http)
                 if not info or not info.get('ok'):
                     error_msg = "Gagal mendapatkan info file dari workers.dev!\n\n"
                     error_msg += "Kemungkinan penyebab:\n"
@@ -720,14 +837,29 @@ class TeraboxGUI:
                     return result
                 
                 self.file_list_data = flatten_files(info['list'])
-                self._file_cache[url] = self.file_list_data
-                self._last_file_check = current_time
+                # String tampilan dihitung sekali di sini, bukan setiap kali tree diisi ulang
+                for f in self.file_list_data:
+                    if not f['is_dir']:
+                        f['_size_str'] = self.downloader.format_size(f['size'])
+                        f['_type_str'] = self.downloader._get_file_type(f['name'])
+                share_params = {
+                    'current_uk': self.current_uk,
+                    'current_shareid': self.current_shareid,
+                    'current_timestamp': self.current_timestamp,
+                    'current_sign': self.current_sign,
+                    'current_cookie': self.current_cookie,
+                    'current_js_token': self.current_js_token
+                }
+                self._file_cache[url] = (self.file_list_data, share_params, time.monotonic() + self._cache_timeout)
+                self._file_cache.move_to_end(url)
+                while len(self._file_cache) > FILE_CACHE_SIZE:
+                    self._file_cache.popitem(last=False)
                 
                 self.root.after(0, self.update_file_list)
                 self.status_var.set("URL berhasil diproses")
                 
             except Exception as e:
-                self.root.after(0, lambda: messagebox.showerror("Error", str(e)))
+                self.root.after(0, messagebox.showerror, "Error", str(e))
                 self.status_var.set("Error: " + str(e))
                 self.logger.error(f"Error processing URL: {str(e)}")
         
@@ -736,16 +868,16 @@ class TeraboxGUI:
     def update_file_list(self):
         """Update the file list in Treeview."""
         self.tree.delete(*self.tree.get_children())
-        
-        for file in self.file_list_data:
-            if not file['is_dir']:
-                values = (
-                    file['name'],
-                    self.downloader._get_file_type(file['name']),
-                    self.downloader.format_size(file['size']),
-                    "Ready"
-                )
-                self.tree.insert("", tk.END, values=values, tags=(file['fs_id'],))
+        self._fsid_to_iid.clear()
+        self._iid_to_file.clear()
+        
+        insert = self.tree.insert
+        for f in self.file_list_data:
+            if f['is_dir']:
+                continue
+            iid = insert("", tk.END, values=(f['name'], f['_type_str'], f['_size_str'], "Ready"), tags=(f['fs_id'],))
+            self._fsid_to_iid[str(f['fs_id'])] = iid
+            self._iid_to_file[iid] = f
                 
     def download_selected(self):
         """Download selected files from the Treeview."""
@@ -754,10 +886,9 @@ class TeraboxGUI:
             messagebox.showwarning("Warning", "Please select files to download!")
             return
             
-        for item in selected:
-            file_data = self.get_file_data(item)
-            if file_data:
-                self.queue_download(file_data)
+        files = [f for f in map(self.get_file_data, selected) if f]
+        if files:
+            self.queue_download(files)
                 
     def download_all(self):
         """Download all files in the list."""
@@ -765,149 +896,270 @@ class TeraboxGUI:
             messagebox.showwarning("Warning", "No files to download!")
             return
             
-        for file in self.file_list_data:
-            if not file['is_dir']:
-                self.queue_download(file)
+        # Semua file masuk antrean sebagai satu item; worker mendaftarkannya ke aria2 per batch
+        files = [f for f in self.file_list_data if not f['is_dir']]
+        if files:
+            self.queue_download(files)
                 
-    def queue_download(self, file_data: Dict[str, Any]):
-        """Add a file to the download queue."""
-        self.download_queue.put(file_data)
-        
-        if not hasattr(self, 'download_thread') or not self.download_thread.is_alive():
-            self.download_thread = threading.Thread(target=self.process_download_queue)
-            self.download_thread.daemon = True
-            self.download_thread.start()
+    def queue_download(self, file_data: Union[Dict[str, Any], List[Dict[str, Any]]]):
+        """Add a file, or a list of files, to the download queue."""
+        self.download_queue.put(file_data if isinstance(file_data, list) else [file_data])
             
     def process_download_queue(self):
-        """Process the download queue."""
+        """Process the download queue (persistent worker; blocks while the queue is empty)."""
         while True:
-            try:
-                file_data = self.download_queue.get(timeout=1)
-            except queue.Empty:
-                break
+            files = self.download_queue.get()
+            
+            # Gabungkan dengan item lain yang sudah antre agar bisa didaftarkan ke aria2 per batch
+            pending = list(files)
+            taken = 1
+            while True:
+                try:
+                    pending.extend(self.download_queue.get_nowait())
+                    taken += 1
+                except queue.Empty:
+                    break
+            
+            for start in range(0, len(pending), ARIA2_BATCH_SIZE):
+                self._process_batch(pending[start:start + ARIA2_BATCH_SIZE])
                 
+            for _ in range(taken):
+                self.download_queue.task_done()
+                
+    def _process_batch(self, batch: List[Dict[str, Any]]):
+        """Siapkan link sebatch file secara paralel lalu pantau satu per satu.
+        
+        File didaftarkan ke aria2 sesuai urutan begitu linknya siap (lihat _register_in_order),
+        jadi file pertama bisa mulai tanpa menunggu link file lain.
+        """
+        # Config aria2 dibuat sekali di sini; thread download_pool hanya memakai path-nya
+        aria2_config = self._create_aria2_config()
+        resolves = [self.download_pool.submit(self._build_add_options, item, aria2_config) for item in batch]
+        registered = [Future() for _ in batch]
+        threading.Thread(
+            target=self._register_in_order,
+            args=(batch, resolves, registered),
+            daemon=True
+        ).start()
+        
+        for item, entry in zip(batch, registered):
+            uris, options, gid = entry.result()
             try:
-                self.download_file(file_data)
+                self.download_file(item, uris, options, gid)
             except Exception as e:
-                self.logger.error(f"Error downloading {file_data['name']}: {str(e)}")
+                self.logger.error(f"Error downloading {item['name']}: {str(e)}")
                 self.status_var.set(f"Error: {str(e)}")
                 
-            self.download_queue.task_done()
-            
-    def download_file(self, file_data: Dict[str, Any]):
-        """Download a single file."""
-        filename = None
+    def _register_in_order(self, batch: List[Dict[str, Any]], resolves: List[Future], registered: List[Future]):
+        """Daftarkan file batch ke aria2 sesuai urutan antrean begitu linknya siap.
+        
+        Setiap putaran menunggu file berikutnya, lalu ikut mengirim file sesudahnya yang linknya
+        sudah siap dalam satu system.multicall. Hasil (uris, options, gid) diberikan lewat registered.
+        """
+        i = 0
         try:
-            self.cancel_flag.clear()
-            self.root.after(0, lambda: self.cancel_btn.config(state=tk.NORMAL))
-            
-            file_name = file_data.get('filename', file_data.get('name', 'Unknown'))
-            self.logger.info(f"Mendapatkan link download untuk {file_name}...")
-            
-            params = {
-                "shareid": self.current_shareid,
-                "uk": self.current_uk,
-                "sign": self.current_sign,
-                "timestamp": self.current_timestamp,
-                "fs_id": file_data['fs_id']
-            }
-            
-            link_result = workers.get_download_link(params)
-            if not link_result or not link_result.get('ok'):
-                error_msg = f"Gagal mendapatkan link download dari workers.dev!\n\n"
-                error_msg += "Kemungkinan penyebab:\n"
-                error_msg += "1. Server workers.dev sedang down\n"
-                error_msg += "2. File mungkin sudah dihapus\n"
-                error_msg += "3. Koneksi internet bermasalah\n\n"
-                error_msg += "Silakan coba lagi nanti."
-                self.logger.error(error_msg)
-                raise Exception(error_msg)
+            while i < len(batch):
+                ready = []
+                j = i
+                while j < len(batch) and (j == i or resolves[j].done()):
+                    try:
+                        uris, options = resolves[j].result()
+                    except Exception as e:
+                        # Biarkan jalur download tunggal mencoba ulang dan mencatat error-nya
+                        self.logger.warning(f"Gagal menyiapkan {batch[j].get('name', 'Unknown')}: {str(e)}")
+                        uris, options = None, None
+                    ready.append((j, uris, options))
+                    j += 1
                 
-            download_url = link_result.get('downloadLink', '')
-            if not download_url:
-                raise Exception("Tidak ada URL download yang valid!")
+                to_submit = [(batch[k], uris, options) for k, uris, options in ready if uris is not None]
+                gids = iter(self._submit_batch(to_submit) if to_submit else [])
+                for k, uris, options in ready:
+                    registered[k].set_result((uris, options, next(gids) if uris is not None else None))
+                i = j
+        except Exception as e:
+            self.logger.error(f"Error mendaftarkan batch ke aria2: {str(e)}")
+        finally:
+            # Jangan biarkan _process_batch menunggu selamanya; sisa file memakai jalur tunggal
+            for entry in registered[i:]:
+                if not entry.done():
+                    entry.set_result((None, None, None))
+            
+    def _build_add_options(self, file_data: Dict[str, Any], aria2_config: Optional[str] = None) -> Tuple[List[str], Dict[str, Any]]:
+        """Mendapatkan link download dan menyusun opsi aria2.addUri untuk satu file.
+        
+        aria2_config diisi oleh _process_batch agar _create_aria2_config tidak dipanggil
+        bersamaan dari beberapa thread download_pool.
+        """
+        file_name = file_data.get('filename', file_data.get('name', 'Unknown'))
+        self.logger.info(f"Mendapatkan link download untuk {file_name}...")
+        
+        params = {
+            "shareid": self.current_shareid,
+            "uk": self.current_uk,
+            "sign": self.current_sign,
+            "timestamp": self.current_timestamp,
+            "fs_id": file_data['fs_id']
+        }
+        
+        link_result = workers.get_download_link(params, session=self.http)
+        if not link_result or not link_result.get('ok'):
+            error_msg = f"Gagal mendapatkan link download dari workers.dev!\n\n"
+            error_msg += "Kemungkinan penyebab:\n"
+            error_msg += "1. Server workers.dev sedang down\n"
+            error_msg += "2. File mungkin sudah dihapus\n"
+            error_msg += "3. Koneksi internet bermasalah\n\n"
+            error_msg += "Silakan coba lagi nanti."
+            self.logger.error(error_msg)
+            raise Exception(error_msg)
             
-            # Cek apakah ini URL proxy dan tampilkan URL asli jika ada
-            if workers.is_proxy_url(download_url) and 'originalLink' in link_result:
-                self.logger.info(f"URL asli (dari proxy): {link_result['originalLink'][:100]}...")
+        download_url = link_result.get('downloadLink', '')
+        if not download_url:
+            raise Exception("Tidak ada URL download yang valid!")
+        
+        # Cek apakah ini URL proxy dan tampilkan URL asli jika ada
+        if workers.is_proxy_url(download_url) and 'originalLink' in link_result:
+            self.logger.info(f"URL asli (dari proxy): {link_result['originalLink'][:100]}...")
+        else:
+            # Jika bukan URL proxy, coba gunakan fungsi wrap_url
+            try:
+                # Bungkus URL dengan proxy untuk menghindari pembatasan
+                wrapped_url = workers.wrap_url(download_url)
+                self.logger.info(f"URL original dibungkus dengan proxy: {wrapped_url[:100]}...")
+                # Gunakan URL yang dibungkus
+                download_url = wrapped_url
+            except Exception as e:
+                self.logger.warning(f"Gagal membungkus URL: {str(e)}, menggunakan URL asli")
+        
+        # Log URL download yang akan digunakan
+        self.logger.info(f"URL download: {download_url}")
+        
+        download_dir = Path(self.settings.get("download_dir", "downloads"))
+        download_dir.mkdir(exist_ok=True)
+        
+        filesize = int(file_data.get('size', 0))
+        if aria2_config is None:
+            aria2_config = self._create_aria2_config()
+        
+        # File besar (> 100 MiB) memakai piece lebih besar agar aria2 tidak menulis ke disk
+        # dalam potongan kecil. check-integrity tidak dipakai: TeraBox tidak menyediakan hash
+        # piece, jadi opsi itu hanya membaca ulang file; verifikasi cukup dengan cek ukuran.
+        # file-allocation tetap "none" supaya file yang terpotong tetap ketahuan dari ukurannya,
+        # dan disk-cache hanya berlaku global (--disk-cache saat aria2c dijalankan).
+        size_options = {
+            "min-split-size": self.settings.get("min_split_size", "1M"),
+            "piece-length": "16M" if filesize > 100 * 1024 * 1024 else "1M",
+            "file-allocation": "none"
+        }
+        
+        options = {
+            "dir": str(download_dir),
+            "out": file_name,
+            "max-connection-per-server": str(self.settings.get("max_connections", 16)),
+            "split": str(self.settings.get("split", 16)),
+            "max-concurrent-downloads": "1",
+            "continue": "true",
+            "max-tries": "10",
+            "retry-wait": "3",
+            "connect-timeout": "60",
+            "timeout": "60",
+            "max-file-not-found": "5",
+            "max-overall-download-limit": "0",
+            "max-download-limit": "0",
+            "auto-file-renaming": "false",
+            "allow-overwrite": "true",
+            "conf-path": aria2_config,
+            "enable-http-pipelining": "true",
+            "stream-piece-selector": "inorder",
+            "optimize-concurrent-downloads": "true",
+            "async-dns": "true",
+            "enable-mmap": "true",
+            "header": [
+                f"Cookie: {self.current_cookie}",
+                "Accept: */*",
+                "Accept-Language: en-US,en;q=0.9",
+                "Connection: keep-alive"
+            ],
+            **size_options
+        }
+        return [download_url], options
+        
+    def _submit_batch(self, items: List[Tuple[Dict[str, Any], List[str], Dict[str, Any]]]) -> List[Optional[str]]:
+        """Mendaftarkan beberapa download ke aria2 lewat satu system.multicall.
+        
+        Mengembalikan GID untuk setiap item sesuai urutan, atau None jika item gagal didaftarkan.
+        """
+        if len(items) == 1:
+            _, uris, options = items[0]
+            try:
+                return [self.aria2.add_uris(uris, options=options).gid]
+            except Exception as e:
+                self.logger.error(f"Gagal menambahkan download ke aria2: {str(e)}")
+                return [None]
+        
+        calls = [{"methodName": "aria2.addUri", "params": [uris, options]} for _, uris, options in items]
+        try:
+            results = self.aria2.client.call("system.multicall", [calls])
+        except Exception as e:
+            self.logger.error(f"Gagal menambahkan batch download ke aria2: {str(e)}")
+            return [None] * len(items)
+        
+        gids = []
+        for (file_data, _, _), result in zip(items, results):
+            # Hasil sukses berupa [gid], hasil gagal berupa dict fault
+            if isinstance(result, list) and result:
+                gids.append(result[0])
             else:
-                # Jika bukan URL proxy, coba gunakan fungsi wrap_url
-                try:
-                    # Bungkus URL dengan proxy untuk menghindari pembatasan
-                    wrapped_url = workers.wrap_url(download_url)
-                    self.logger.info(f"URL original dibungkus dengan proxy: {wrapped_url[:100]}...")
-                    # Gunakan URL yang dibungkus
-                    download_url = wrapped_url
-                except Exception as e:
-                    self.logger.warning(f"Gagal membungkus URL: {str(e)}, menggunakan URL asli")
+                self.logger.error(f"aria2 menolak {file_data.get('name', 'Unknown')}: {result}")
+                gids.append(None)
+        self.logger.info(f"{len(items)} download ditambahkan ke aria2 dalam satu batch")
+        return gids
             
-            # Log URL download yang akan digunakan
-            self.logger.info(f"URL download: {download_url}")
+    def download_file(self, file_data: Dict[str, Any], uris: Optional[List[str]] = None,
+                      options: Optional[Dict[str, Any]] = None, gid: Optional[str] = None):
+        """Download a single file.
+        
+        Jika uris/options belum disiapkan, link diambil di sini; jika gid diberikan, download
+        sudah didaftarkan ke aria2 oleh _submit_batch dan tinggal dipantau.
+        """
+        filename = None
+        file_name = file_data.get('filename', file_data.get('name', 'Unknown'))
+        try:
+            self.cancel_flag.clear()
+            self.root.after(0, self.cancel_btn.config, {"state": tk.NORMAL})
             
-            download_dir = Path(self.settings.get("download_dir", "downloads"))
-            download_dir.mkdir(exist_ok=True)
+            if uris is None or options is None:
+                uris, options = self._build_add_options(file_data)
+            download_url = uris[0]
+            download_dir = Path(options["dir"])
+            aria2_config = options["conf-path"]
             
             filename = download_dir / file_name
             filesize = int(file_data.get('size', 0))
+            total_size_str = self.downloader.format_size(filesize)
             
             self.status_var.set(f"Downloading: {file_name}")
-            self.logger.info(f"Starting download {file_name} ({self.downloader.format_size(filesize)})")
+            self.logger.info(f"Starting download {file_name} ({total_size_str})")
             
-            for item in self.tree.get_children():
-                if self.tree.item(item)['values'][0] == file_name:
-                    self.tree.set(item, "Status", "Downloading...")
-                    break
+            self._set_tree_status(file_data['fs_id'], "Downloading...")
             
             self.start_time = time.time()
+            self._last_progress_snapshot = None
             
-            aria2_config = self.downloader._create_aria2_config()
-            self.logger.info("Konfigurasi aria2 berhasil dibuat dengan trackers")
-            
-            download = self.aria2.add_uris(
-                [download_url],
-                options={
-                    "dir": str(download_dir),
-                    "out": file_name,
-                    "max-connection-per-server": str(self.settings.get("max_connections", 16)),
-                    "split": str(self.settings.get("split", 16)),
-                    "min-split-size": self.settings.get("min_split_size", "1M"),
-                    "max-concurrent-downloads": "1",
-                    "continue": "true",
-                    "max-tries": "10",
-                    "retry-wait": "3",
-                    "connect-timeout": "60",
-                    "timeout": "60",
-                    "max-file-not-found": "5",
-                    "max-overall-download-limit": "0",
-                    "max-download-limit": "0",
-                    "file-allocation": "none",
-                    "auto-file-renaming": "false",
-                    "allow-overwrite": "true",
-                    "conf-path": aria2_config,
-                    "check-integrity": "true",
-                    "disk-cache": "64M",
-                    "piece-length": "1M",
-                    "enable-http-pipelining": "true",
-                    "stream-piece-selector": "inorder",
-                    "optimize-concurrent-downloads": "true",
-                    "async-dns": "true",
-                    "enable-mmap": "true",
-                    "header": [
-                        f"Cookie: {self.current_cookie}",
-                        "Accept: */*",
-                        "Accept-Language: en-US,en;q=0.9",
-                        "Connection: keep-alive"
-                    ]
-                }
-            )
+            if gid is not None:
+                download = self.aria2.get_download(gid)
+            else:
+                # Taruh di depan antrean aria2 agar tidak menunggu di belakang file batch lain
+                download = self.aria2.add_uris(uris, options=options, position=0)
             self.logger.info("Download berhasil ditambahkan ke aria2 dengan priority network")
             
-            last_update_time = time.time()
             last_downloaded = 0
             retry_count = 0
             max_retries = 3
             stall_time = 0
             last_progress_time = time.time()
+            sleep_s = POLL_MIN_S
+            last_log_progress = -1.0
+            last_log_time = 0.0
             
             while not download.is_complete:
                 if self.cancel_flag.is_set():
@@ -915,80 +1167,106 @@ class TeraboxGUI:
                     raise Exception("Download dibatalkan oleh pengguna")
                     
                 try:
-                    download.update()
+                    active = self._poll_active().get(download.gid)
+                    if active is None:
+                        # Tidak lagi aktif (selesai, gagal, atau masih antre): ambil status lengkapnya
+                        download.update()
                     current_time = time.time()
                     
-                    if current_time - last_update_time >= 0.25:
+                    if active is not None:
+                        downloaded = int(active["completedLength"])
+                        speed = int(active["downloadSpeed"])
+                    else:
                         downloaded = download.completed_length
                         speed = download.download_speed
-                        
-                        progress = (downloaded / filesize) * 100
-                        self.logger.info(f"Progress: {progress:.1f}% Speed: {self.downloader.format_size(speed)}/s Downloaded: {self.downloader.format_size(downloaded)} / {self.downloader.format_size(filesize)}")
-                        
-                        self.update_progress_ui(
-                            file_name,
-                            downloaded,
-                            filesize,
-                            speed
-                        )
-                        
-                        if downloaded == last_downloaded:
-                            stall_time = current_time - last_progress_time
-                            if stall_time > 30:
-                                retry_count += 1
-                                self.logger.warning(f"Download stuck selama {stall_time:.1f} detik")
+                    
+                    progress = (downloaded / filesize) * 100
+                    # Log progres hanya tiap kenaikan >= 1% atau tiap 5 detik, bukan setiap polling
+                    if (progress - last_log_progress >= 1.0 or current_time - last_log_time >= 5.0) \
+                            and self.logger.isEnabledFor(logging.INFO):
+                        self.logger.info(f"Progress: {progress:.1f}% Speed: {self.downloader.format_size(speed)}/s Downloaded: {self.downloader.format_size(downloaded)} / {total_size_str}")
+                        last_log_progress = progress
+                        last_log_time = current_time
+                    
+                    self.update_progress_ui(
+                        file_name,
+                        downloaded,
+                        filesize,
+                        speed,
+                        total_size_str
+                    )
+                    
+                    if downloaded == last_downloaded and active is None and download.is_waiting:
+                        # Masih antre di aria2 di belakang download lain; belum dihitung sebagai stuck
+                        last_progress_time = current_time
+                        stall_time = 0
+                        retry_count = 0
+                        sleep_s = POLL_MIN_S
+                    elif downloaded == last_downloaded:
+                        stall_time = current_time - last_progress_time
+                        if stall_time > 30:
+                            retry_count += 1
+                            self.logger.warning(f"Download stuck selama {stall_time:.1f} detik")
+                            
+                            if retry_count >= max_retries:
+                                self.logger.info("Download stuck, mencoba restart dengan parameter berbeda...")
                                 
-                                if retry_count >= max_retries:
-                                    self.logger.info("Download stuck, mencoba restart dengan parameter berbeda...")
-                                    download.remove()
-                                    
-                                    download = self.aria2.add_uris(
-                                        [download_url],
-                                        options={
-                                            "dir": str(download_dir),
-                                            "out": file_name,
-                                            "continue": "true",
-                                            "max-connection-per-server": "8",
-                                            "split": "8",
-                                            "min-split-size": "2M",
-                                            "piece-length": "2M",
-                                            "lowest-speed-limit": "1M",
-                                            "stream-piece-selector": "random",
-                                            "optimize-concurrent-downloads": "true",
-                                            "async-dns": "true",
-                                            "enable-mmap": "true",
-                                            "conf-path": aria2_config
-                                        }
-                                    )
-                                    retry_count = 0
-                                    stall_time = 0
-                        else:
-                            stall_time = 0
-                            last_progress_time = current_time
-                            retry_count = 0
-                        
-                        last_update_time = current_time
-                        last_downloaded = downloaded
-                        
+                                # Tambahkan pengganti di depan antrean sebelum yang lama dihapus, supaya
+                                # aria2 langsung memulainya dan bukan file batch berikutnya
+                                restarted = self.aria2.add_uris(
+                                    [download_url],
+                                    options={
+                                        "dir": str(download_dir),
+                                        "out": file_name,
+                                        "continue": "true",
+                                        "max-connection-per-server": "8",
+                                        "split": "8",
+                                        "min-split-size": "2M",
+                                        "piece-length": "2M",
+                                        "lowest-speed-limit": "1M",
+                                        "stream-piece-selector": "random",
+                                        "optimize-concurrent-downloads": "true",
+                                        "async-dns": "true",
+                                        "enable-mmap": "true",
+                                        "conf-path": aria2_config
+                                    },
+                                    position=0
+                                )
+                                download.remove()
+                                download = restarted
+                                retry_count = 0
+                                stall_time = 0
+                        sleep_s = POLL_MIN_S
+                    else:
+                        stall_time = 0
+                        last_progress_time = current_time
+                        retry_count = 0
+                        # Progres stabil: jarangkan polling, kecuali sudah mendekati selesai
+                        sleep_s = min(sleep_s * 1.5, POLL_MAX_S) if progress < 90 else POLL_MIN_S
+                        if speed > 0:
+                            # Jangan tidur lebih lama dari seperempat sisa waktu (ETA)
+                            sleep_s = min(sleep_s, max(POLL_MIN_S, (filesize - downloaded) / speed / 4))
+                    
+                    last_downloaded = downloaded
+                    
                 except Exception as e:
                     self.logger.error(f"Aria2 error: {str(e)}")
-                    continue
+                    sleep_s = POLL_MIN_S
                     
-                time.sleep(0.1)
+                # wait() bangun lebih cepat jika download dibatalkan
+                self.cancel_flag.wait(sleep_s)
             
-            if os.path.exists(filename):
-                actual_size = os.path.getsize(filename)
+            try:
+                file_stat = os.stat(filename)
+            except FileNotFoundError:
+                file_stat = None
+                
+            if file_stat is not None:
+                actual_size = file_stat.st_size
                 if actual_size == filesize:
-                    try:
-                        with open(filename, 'rb') as f:
-                            chunk_size = 8192
-                            while chunk := f.read(chunk_size):
-                                pass
-                        success = True
-                        self.logger.info(f"File {file_name} berhasil diverifikasi")
-                    except Exception as e:
-                        success = False
-                        self.logger.error(f"File corrupt: {str(e)}")
+                    # aria2 sudah memvalidasi data saat download, cukup cek ukuran
+                    success = True
+                    self.logger.info(f"File {file_name} berhasil diverifikasi")
                 else:
                     success = False
                     self.logger.error(f"Ukuran file tidak sesuai. Expected: {filesize}, Actual: {actual_size}")
@@ -996,13 +1274,10 @@ class TeraboxGUI:
                 success = False
                 self.logger.error("File tidak ditemukan setelah download")
                 
-            for item in self.tree.get_children():
-                if self.tree.item(item)['values'][0] == file_name:
-                    status = "Completed" if success else "Failed"
-                    if self.cancel_flag.is_set():
-                        status = "Cancelled"
-                    self.tree.set(item, "Status", status)
-                    break
+            status = "Completed" if success else "Failed"
+            if self.cancel_flag.is_set():
+                status = "Cancelled"
+            self._set_tree_status(file_data['fs_id'], status)
             
             if success and not self.cancel_flag.is_set():
                 self.status_var.set(f"Successfully downloaded: {file_name}")
@@ -1010,65 +1285,68 @@ class TeraboxGUI:
             elif self.cancel_flag.is_set():
                 self.status_var.set("Download cancelled")
                 self.add_to_history(file_data, "Cancelled")
-                if os.path.exists(filename):
-                    os.remove(filename)
+                filename.unlink(missing_ok=True)
             else:
                 self.status_var.set(f"Failed to download: {file_name}")
                 self.add_to_history(file_data, "Failed")
-                if os.path.exists(filename):
-                    os.remove(filename)
+                filename.unlink(missing_ok=True)
                 
-            self.root.after(0, lambda: [
-                self.progress_var.set(0),
-                self.current_file_label.config(text=""),
-                self.speed_label.config(text=""),
-                self.eta_label.config(text=""),
-                self.progress_label.config(text="Ready to download..."),
-                self.size_label.config(text=""),
-                self.cancel_btn.config(state=tk.DISABLED)
-            ])
+            self.root.after(0, self._reset_progress_ui)
                 
         except Exception as e:
             self.logger.error(f"Error downloading {file_name}: {str(e)}")
             self.status_var.set(f"Error: {str(e)}")
             self.add_to_history(file_data, "Error")
-            for item in self.tree.get_children():
-                if self.tree.item(item)['values'][0] == file_name:
-                    status = "Cancelled"
-                    if "dibatalkan" in str(e):
-                        status = "Cancelled"
-                    self.tree.set(item, "Status", status)
-                    break
-            if filename and os.path.exists(filename):
-                os.remove(filename)
-            self.root.after(0, lambda: self.cancel_btn.config(state=tk.DISABLED))
+            self._set_tree_status(file_data['fs_id'], "Cancelled")
+            if filename:
+                filename.unlink(missing_ok=True)
+            self.root.after(0, self.cancel_btn.config, {"state": tk.DISABLED})
             
+    def _poll_active(self) -> Dict[str, Dict[str, str]]:
+        """Ambil progres semua download aktif dalam satu RPC aria2.tellActive."""
+        active = self.aria2.client.tell_active(keys=ARIA2_PROGRESS_KEYS)
+        self.current_downloads = {item["gid"]: item for item in active}
+        return self.current_downloads
+        
     def get_file_data(self, item: str) -> Optional[Dict[str, Any]]:
         """Get file data from Treeview item."""
-        values = self.tree.item(item)['values']
-        if not values:
-            return None
-            
-        for file in self.file_list_data:
-            if file['name'] == values[0]:
-                return file
-        return None
+        return self._iid_to_file.get(item)
+    
+    def _set_tree_status(self, fs_id: Any, status: str):
+        """Update kolom Status pada baris Treeview milik file dengan fs_id tertentu."""
+        iid = self._fsid_to_iid.get(str(fs_id))
+        if iid:
+            self.tree.set(iid, "Status", status)
         
     def on_closing(self):
         """Handle application closing."""
         if messagebox.askokcancel("Exit", "Are you sure you want to exit?"):
             self.kill_aria2_process()
+            # Tunggu penulisan settings/history yang masih antre sebelum keluar
+            self._flush_history()
+            self._persist_q.put(None)
+            self._persist_thread.join(timeout=2)
             self.root.quit()
             
     def run(self):
         """Start the GUI application."""
         self.root.mainloop()
 
-    def update_progress_ui(self, file_name: str, downloaded: int, total: int, speed: float):
-        """Update progress UI with download information."""
+    def update_progress_ui(self, file_name: str, downloaded: int, total: int, speed: float,
+                           total_size: Optional[str] = None):
+        """Update progress UI with download information.
+        
+        total_size adalah string ukuran total yang sudah diformat pemanggil (konstan selama download).
+        """
         try:
+            # Polling saat stall atau speed konstan menghasilkan nilai yang sama; tidak perlu diformat ulang
+            snapshot = (file_name, downloaded, speed)
+            if snapshot == self._last_progress_snapshot:
+                return
+                
             current_time = time.time()
             if not hasattr(self, '_last_ui_update') or current_time - self._last_ui_update >= 0.25:
+                self._last_progress_snapshot = snapshot
                 self._last_ui_update = current_time
                 
                 progress = (downloaded / total) * 100
@@ -1085,60 +1363,71 @@ class TeraboxGUI:
                     eta_text = "ETA: Calculating..."
                 
                 current_size = self.downloader.format_size(downloaded)
-                total_size = self.downloader.format_size(total)
+                if total_size is None:
+                    total_size = self.downloader.format_size(total)
                 speed_text = f"{self.downloader.format_size(speed)}/s"
                 
-                self._ui_update_queue.put({
+                update = {
                     'progress': progress,
                     'file_name': file_name,
                     'speed': speed_text,
                     'eta': eta_text,
                     'progress_text': f"{progress:.1f}%",
                     'size_text': f"{current_size} / {total_size}"
-                })
+                }
                 
-                if not self._ui_update_running:
-                    self._start_ui_update_thread()
+                # Hanya update terbaru yang disimpan; yang belum sempat tampil ditimpa
+                with self._pending_ui_lock:
+                    self._pending_ui = update
+                    schedule = not self._ui_flush_scheduled
+                    self._ui_flush_scheduled = True
+                if schedule:
+                    self.root.after(UI_FLUSH_MS, self._flush_progress)
                 
         except Exception as e:
             self.logger.error(f"Error updating progress UI: {str(e)}")
             
-    def _start_ui_update_thread(self):
-        """Start thread untuk update UI."""
-        def update_ui():
-            self._ui_update_running = True
-            while True:
-                try:
-                    updates = []
-                    while not self._ui_update_queue.empty():
-                        updates.append(self._ui_update_queue.get_nowait())
-                    
-                    if not updates:
-                        self._ui_update_running = False
-                        break
-                        
-                    update = updates[-1]
-                    
-                    self.root.after(0, lambda: [
-                        self.progress_var.set(update['progress']),
-                        self.current_file_label.config(text=update['file_name']),
-                        self.speed_label.config(text=update['speed']),
-                        self.eta_label.config(text=update['eta']),
-                        self.progress_label.config(text=update['progress_text']),
-                        self.size_label.config(text=update['size_text'])
-                    ])
-                    
-                    time.sleep(0.25)
-                    
-                except queue.Empty:
-                    self._ui_update_running = False
-                    break
-                except Exception as e:
-                    self.logger.error(f"Error in UI update thread: {str(e)}")
-                    self._ui_update_running = False
-                    break
-                    
-        threading.Thread(target=update_ui, daemon=True).start()
+    def _flush_progress(self):
+        """Tampilkan update progress terbaru di main thread Tk (dijadwalkan oleh update_progress_ui)."""
+        with self._pending_ui_lock:
+            update, self._pending_ui = self._pending_ui, None
+            self._ui_flush_scheduled = False
+        try:
+            if update is not None:
+                self._apply_ui_state(update)
+        except Exception as e:
+            self.logger.error(f"Error updating progress UI: {str(e)}")
+                
+    def _reset_progress_ui(self):
+        """Kembalikan panel progress ke keadaan idle setelah download selesai (main thread)."""
+        with self._pending_ui_lock:
+            # Update yang masih tertunda milik download yang sudah selesai; jangan ditampilkan
+            self._pending_ui = None
+        self._last_ui.clear()
+        self._apply_ui_state(IDLE_UI_STATE)
+        self.cancel_btn.config(state=tk.DISABLED)
+                
+    def _apply_ui_state(self, state: Dict[str, Any]):
+        """Terapkan state progress ke widget (dijalankan di main thread).
+        
+        Hanya widget yang nilainya berubah sejak update terakhir yang disentuh.
+        """
+        widgets = {
+            'file_name': self.current_file_label,
+            'speed': self.speed_label,
+            'eta': self.eta_label,
+            'progress_text': self.progress_label,
+            'size_text': self.size_label
+        }
+        
+        if self._last_ui.get('progress') != state['progress']:
+            self.progress_var.set(state['progress'])
+            self._last_ui['progress'] = state['progress']
+            
+        for key, widget in widgets.items():
+            if self._last_ui.get(key) != state[key]:
+                widget.config(text=state[key])
+                self._last_ui[key] = state[key]
 
     def cancel_download(self):
         """Cancel the current download."""
@@ -1157,26 +1446,35 @@ class TeraboxGUI:
             
             trackers_file = Path("config/trackers.txt")
             
-            if trackers_file.exists():
-                trackers_file.unlink()
+            trackers_file.unlink(missing_ok=True)
+            
+            def fetch_trackers(url: str) -> set:
+                with self.http.get(url, stream=True, timeout=10) as response:
+                    response.raise_for_status()
+                    response.encoding = response.encoding or 'utf-8'
+                    return {line.strip() for line in response.iter_lines(decode_unicode=True) if line and line.strip()}
             
             combined_trackers = set()
             
-            for url in trackers_urls:
-                try:
-                    response = requests.get(url)
-                    response.raise_for_status()
-                    trackers = set(line.strip() for line in response.text.split('\n') if line.strip())
-                    combined_trackers.update(trackers)
-                    self.logger.info(f"Berhasil mengambil trackers dari {url}")
-                except Exception as e:
-                    self.logger.error(f"Error mengambil trackers dari {url}: {str(e)}")
+            with ThreadPoolExecutor(max_workers=len(trackers_urls)) as executor:
+                futures = {executor.submit(fetch_trackers, url): url for url in trackers_urls}
+                for future in as_completed(futures):
+                    url = futures[future]
+                    try:
+                        combined_trackers |= future.result()
+                        self.logger.info(f"Berhasil mengambil trackers dari {url}")
+                    except Exception as e:
+                        self.logger.error(f"Error mengambil trackers dari {url}: {str(e)}")
             
             if combined_trackers:
-                trackers_file.write_text('\n'.join(sorted(combined_trackers)))
+                trackers = sorted(combined_trackers, key=str.lower)
+                trackers_file.write_text('\n'.join(trackers))
+                self._bt_trackers = ','.join(trackers)
                 self.logger.info(f"Berhasil menyimpan {len(combined_trackers)} trackers unik")
             else:
-                trackers_file.write_text(self.downloader._get_default_trackers())
+                default_trackers = self.downloader._get_default_trackers()
+                trackers_file.write_text(default_trackers)
+                self._bt_trackers = ','.join(default_trackers.split())
                 self.logger.info("Menggunakan trackers default karena gagal mengambil dari sumber online")
             
         except Exception as e:
@@ -1186,13 +1484,27 @@ class TeraboxGUI:
                 self.logger.info("Menggunakan trackers default")
 
     def _create_aria2_config(self) -> str:
-        """Membuat konfigurasi aria2 dengan trackers dari file."""
+        """Membuat konfigurasi aria2 dengan trackers dari file.
+        
+        File hanya ditulis ulang jika settings atau trackers.txt berubah sejak pemanggilan terakhir.
+        """
         try:
             trackers_file = Path("config/trackers.txt")
             if not trackers_file.exists():
                 self.update_trackers()
             
-            trackers = trackers_file.read_text().strip()
+            config_path = Path('aria2.conf')
+            settings_hash = hash(json.dumps(self.settings, sort_keys=True))
+            trackers_mtime = trackers_file.stat().st_mtime_ns
+            
+            cache = self._aria2_conf_cache
+            if cache and cache[1:] == (settings_hash, trackers_mtime) and config_path.exists():
+                return cache[0]
+            
+            # Pakai daftar yang sudah disiapkan update_trackers; file hanya dibaca jika belum ada
+            bt_trackers = self._bt_trackers
+            if bt_trackers is None:
+                bt_trackers = ','.join(trackers_file.read_text().split())
             
             config = {
                 'max-connection-per-server': str(self.settings.get("max_connections", 16)),
@@ -1203,7 +1515,7 @@ class TeraboxGUI:
                 'max-tries': '0',
                 'retry-wait': '3',
                 'user-agent': self.settings.get("user_agent", "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"),
-                'bt-tracker': trackers.replace('\n', ','),
+                'bt-tracker': bt_trackers,
                 'enable-dht': 'true',
                 'enable-peer-exchange': 'true',
                 'bt-enable-lpd': 'true',
@@ -1212,35 +1524,88 @@ class TeraboxGUI:
                 'seed-ratio': '0.0'
             }
             
-            config_path = Path('aria2.conf')
-            with open(config_path, 'w') as f:
-                for key, value in config.items():
-                    f.write(f'{key}={value}\n')
-                
+            # Settings yang berubah belum tentu mengubah isi file (mis. hanya download_dir/theme)
+            config_text = ''.join(f'{key}={value}\n' for key, value in config.items())
+            config_hash = hashlib.blake2b(config_text.encode('utf-8'), digest_size=16).digest()
+            if config_hash != self._aria2_conf_hash or not config_path.exists():
+                config_path.write_text(config_text)
+                self._aria2_conf_hash = config_hash
+            
+            self._aria2_conf_cache = (str(config_path), settings_hash, trackers_mtime)
             return str(config_path)
             
         except Exception as e:
             self.logger.error(f"Error creating aria2 config: {str(e)}")
+            self._aria2_conf_cache = None
+            self._aria2_conf_hash = None
             return self.downloader._create_aria2_config()
 
     def load_download_history(self) -> List[Dict[str, Any]]:
-        """Load download history from JSON file."""
+        """Load download history from the JSONL file, newest first."""
         try:
             if self.history_file.exists():
-                with open(self.history_file, 'r') as f:
-                    history = json.load(f)
-                    self.logger.info("Successfully loaded download history")
-                    return history
+                history = []
+                for line in self.history_file.read_bytes().splitlines():
+                    if not line.strip():
+                        continue
+                    try:
+                        history.append(orjson.loads(line) if orjson is not None else json.loads(line))
+                    except ValueError:
+                        # Baris terakhir bisa terpotong jika aplikasi mati saat menulis
+                        self.logger.warning("Melewati baris history yang rusak")
+                self._history_lines = len(history)
+                history.reverse()
+                self.logger.info("Successfully loaded download history")
+                return history[:HISTORY_LIMIT]
+                
+            # Migrasi sekali dari format lama (satu array JSON, entri terbaru di depan)
+            legacy_file = self.history_file.with_name("download_history.json")
+            if legacy_file.exists():
+                if orjson is not None:
+                    history = orjson.loads(legacy_file.read_bytes())
+                else:
+                    with open(legacy_file, 'r') as f:
+                        history = json.load(f)
+                history = history[:HISTORY_LIMIT]
+                self._history_lines = len(history)
+                self._persist_q.put((self.history_file, self._encode_history(reversed(history)), False))
+                self.logger.info(f"History dimigrasikan dari {legacy_file.name}")
+                return history
         except Exception as e:
             self.logger.error(f"Error loading download history: {str(e)}")
         return []
 
+    def _encode_history(self, entries) -> bytes:
+        """Serialisasi entri history menjadi baris JSONL ringkas."""
+        if orjson is not None:
+            return b"".join(orjson.dumps(entry) + b"\n" for entry in entries)
+        return "".join(json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n" for entry in entries).encode('utf-8')
+
     def save_download_history(self):
-        """Save download history to JSON file."""
+        """Rewrite the whole history file (used when clearing or compacting)."""
+        try:
+            with self._history_lock:
+                # Entri yang belum di-flush sudah termasuk di download_history
+                self._history_pending = []
+            self._history_lines = len(self.download_history)
+            self._persist_q.put((self.history_file, self._encode_history(reversed(self.download_history)), False))
+        except Exception as e:
+            self.logger.error(f"Error saving download history: {str(e)}")
+
+    def _flush_history(self):
+        """Append entri history yang tertunda ke file (dijadwalkan oleh add_to_history)."""
+        with self._history_lock:
+            pending, self._history_pending = self._history_pending, []
+            self._history_flush_scheduled = False
+        if not pending:
+            return
         try:
-            with open(self.history_file, 'w') as f:
-                json.dump(self.download_history, f, indent=4)
-            self.logger.info("Successfully saved download history")
+            self._history_lines += len(pending)
+            if self._history_lines > 2 * HISTORY_LIMIT:
+                # File hanya di-append; sesekali tulis ulang agar entri di luar batas terbuang
+                self.save_download_history()
+            else:
+                self._persist_q.put((self.history_file, self._encode_history(pending), True))
         except Exception as e:
             self.logger.error(f"Error saving download history: {str(e)}")
 
@@ -1257,9 +1622,16 @@ class TeraboxGUI:
             "location": file_path
         }
         self.download_history.insert(0, history_entry)
-        if len(self.download_history) > 100:
-            self.download_history = self.download_history[:100]
-        self.save_download_history()
+        if len(self.download_history) > HISTORY_LIMIT:
+            self.download_history = self.download_history[:HISTORY_LIMIT]
+            
+        # Beberapa download yang selesai berdekatan ditulis sekaligus
+        with self._history_lock:
+            self._history_pending.append(history_entry)
+            schedule = not self._history_flush_scheduled
+            self._history_flush_scheduled = True
+        if schedule:
+            self.root.after(HISTORY_FLUSH_MS, self._flush_history)
 
     def show_download_history(self):
         """Show download history window."""
@@ -1319,8 +1691,7 @@ class TeraboxGUI:
         if messagebox.askyesno("Clear History", "Are you sure you want to clear download history?"):
             self.download_history = []
             self.save_download_history()
-            for item in tree.get_children():
-                tree.delete(item)
+            tree.delete(*tree.get_children())
 
     def open_donate_link(self):
         """Open donate link in browser."""
@@ -1354,14 +1725,50 @@ class TeraboxGUI:
             self.logger.error(f"Error checking for updates on startup: {str(e)}")
 
     def kill_aria2_process(self):
-        """Kill proses aria2c.exe saat program ditutup."""
+        """Hentikan proses aria2c yang dijalankan aplikasi ini saat program ditutup.
+        
+        Utamakan aria2.shutdown lewat RPC; jika belum berhenti, hanya proses milik aplikasi ini
+        yang di-terminate/kill (instance aria2c lain milik pengguna tidak ikut dimatikan).
+        """
+        process = self._aria2_process
+        if process is None:
+            return
+            
+        if process.poll() is not None:
+            # aria2c milik aplikasi ini sudah berhenti (mis. gagal bind port 6800); aria2c yang
+            # mungkin melayani port itu bukan milik kita, jadi jangan dimatikan
+            self.logger.info("Proses aria2c milik aplikasi sudah tidak berjalan")
+            return
+            
+        if hasattr(self, 'aria2'):
+            try:
+                self.aria2.client.shutdown()
+                process.wait(timeout=0.5)
+                if not self._aria2_rpc_open():
+                    self.logger.info("Berhasil mematikan aria2c lewat RPC")
+                    return
+                self.logger.warning("Port RPC aria2c masih menjawab setelah shutdown")
+            except Exception as e:
+                self.logger.warning(f"Shutdown aria2c lewat RPC gagal: {str(e)}")
+                
         try:
-            subprocess.run(['taskkill', '/F', '/IM', 'aria2c.exe'], 
-                         stdout=subprocess.DEVNULL, 
-                         stderr=subprocess.DEVNULL)
-            self.logger.info("Berhasil mematikan proses aria2c.exe")
+            process.terminate()
+            try:
+                process.wait(timeout=3)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait(timeout=3)
+            self.logger.info("Berhasil mematikan proses aria2c")
         except Exception as e:
-            self.logger.error(f"Error saat mematikan proses aria2c.exe: {str(e)}")
+            self.logger.error(f"Error saat mematikan proses aria2c: {str(e)}")
+
+    def _aria2_rpc_open(self) -> bool:
+        """Cek apakah masih ada proses yang menerima koneksi di port RPC aria2 (localhost:6800)."""
+        try:
+            with socket.create_connection(("localhost", 6800), timeout=0.2):
+                return True
+        except OSError:
+            return False
 
 def main():
     """Main entry point for the TeraBox GUI application."""
@@ -34,6 +34,26 @@ WORKERS_BASE_URL = WORKERS_ENDPOINTS[0]
 logger = logging.getLogger(__name__)
 
 
+def _create_session() -> requests.Session:
+    """
+    Membuat session HTTP bersama untuk semua request ke workers.dev.
+
+    Koneksi keep-alive dipakai ulang antar panggilan sehingga handshake TCP/TLS
+    tidak diulang untuk setiap get_info/get_download_link.
+
+    Returns:
+        requests.Session: Session dengan connection pool
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=len(WORKERS_ENDPOINTS), pool_maxsize=8)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+_session = _create_session()
+
+
 def extract_shorturl(url: str) -> Optional[str]:
     """
     Ekstrak shorturl dari URL TeraBox lengkap.
@@ -147,7 +167,7 @@ def wrap_url(original_url: str) -> str:
     return f'https://{selected_base}.workers.dev/?url={b64_encoded}'
 
 
-def get_info(shorturl: str, cookies: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+def get_info(shorturl: str, cookies: Optional[Dict[str, str]] = None, session: Optional[requests.Session] = None) -> Optional[Dict[str, Any]]:
     """
     Mendapatkan informasi file/folder dari shorturl TeraBox via workers.dev.
     Menggunakan endpoint /api/get-info-new sebagai prioritas utama dengan fallback ke /api/get-info.
@@ -155,10 +175,13 @@ def get_info(shorturl: str, cookies: Optional[Dict[str, str]] = None) -> Optiona
     Args:
         shorturl (str): Kode shorturl dari link TeraBox (contoh: '1DcGWQPuMVDgkXrFhP7AlcQ').
         cookies (Optional[Dict[str, str]]): Cookies opsional untuk request.
+        session (Optional[requests.Session]): Session milik pemanggil; default session modul.
 
     Returns:
         Optional[Dict[str, Any]]: Hasil JSON dari API jika sukses, None jika gagal.
     """
+    http = session or _session
+    
     # Ekstrak shorturl jika yang diberikan adalah URL lengkap
     extracted = extract_shorturl(shorturl)
     if extracted:
@@ -196,7 +219,7 @@ def get_info(shorturl: str, cookies: Optional[Dict[str, str]] = None) -> Optiona
                 current_url = f"{base_url}{api_endpoint}"
                 logger.info(f"Mencoba endpoint: {current_url}")
                 
-                resp = requests.get(current_url, params=params, headers=headers, cookies=cookies, timeout=20)
+                resp = http.get(current_url, params=params, headers=headers, cookies=cookies, timeout=20)
                 resp.raise_for_status()
                 
                 # Handle potential JSON parsing issues by ensuring proper decoding
@@ -239,7 +262,7 @@ def get_info(shorturl: str, cookies: Optional[Dict[str, str]] = None) -> Optiona
     return None
 
 
-def get_download_link(params: Dict[str, Any], cookies: Optional[Dict[str, str]] = None, shorturl: Optional[str] = None) -> Optional[Dict[str, Any]]:
+def get_download_link(params: Dict[str, Any], cookies: Optional[Dict[str, str]] = None, shorturl: Optional[str] = None, session: Optional[requests.Session] = None) -> Optional[Dict[str, Any]]:
     """
     Mendapatkan direct download link dari workers.dev.
     Menggunakan endpoint /api/get-downloadp.
@@ -248,10 +271,13 @@ def get_download_link(params: Dict[str, Any], cookies: Optional[Dict[str, str]]
         params (Dict[str, Any]): Dict berisi shareid, uk, sign, timestamp, fs_id.
         cookies (Optional[Dict[str, str]]): Cookies opsional untuk request.
         shorturl (Optional[str]): Shorturl untuk refresh token jika diperlukan.
+        session (Optional[requests.Session]): Session milik pemanggil; default session modul.
 
     Returns:
         Optional[Dict[str, Any]]: Hasil JSON dari API jika sukses, None jika gagal.
     """
+    http = session or _session
+    
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.6261.112 Safari/537.36",
         "Content-Type": "application/json",
@@ -275,7 +301,7 @@ def get_download_link(params: Dict[str, Any], cookies: Optional[Dict[str, str]]
             headers["Referer"] = f"{base_url}/"
             headers["Origin"] = base_url
             
-            resp = requests.post(current_url, json=params, headers=headers, cookies=cookies, timeout=20)
+            resp = http.post(current_url, json=params, headers=headers, cookies=cookies, timeout=20)
             resp.raise_for_status()
             
             # Handle potential JSON parsing issues by ensuring proper decoding
@@ -331,7 +357,7 @@ def get_download_link(params: Dict[str, Any], cookies: Optional[Dict[str, str]]
                     # Try to refresh token if shorturl is provided
                     if shorturl and i == 0:  # Only retry on first endpoint
                         logger.info(f"Mencoba refresh token untuk {base_url}...")
-                        fresh_info = get_info(shorturl)
+                        fresh_info = get_info(shorturl, session=http)
                         if fresh_info and fresh_info.get('ok'):
                             # Update params with fresh token data
                             params.update({
@@ -343,7 +369,7 @@ def get_download_link(params: Dict[str, Any], cookies: Optional[Dict[str, str]]
                             logger.info(f"Token berhasil di-refresh, mencoba download lagi...")
                             # Retry the request with fresh params
                             try:
-                                resp = requests.post(current_url, json=params, headers=headers, cookies=cookies, timeout=20)
+                                resp = http.post(current_url, json=params, headers=headers, cookies=cookies, timeout=20)
                                 resp.raise_for_status()
                                 data = resp.json()
                                 if data.get("ok"):